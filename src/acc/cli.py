@@ -19,7 +19,8 @@ def cli_simulate(kp: float = 0.5,
                  windup_protection: bool = False,
                  vi: float = 30.0,
                  road_inclinations: bool = False,
-                 simulation_time: float = 3_600.0
+                 simulation_time: float = 3_600.0,
+                 fast_forward: bool = False,
                  ) -> SimulationResult:
     print("\n[cyan]Running simulation with the following parameters[/cyan]:")
     print(f"  - Kp: {kp}")
@@ -28,6 +29,7 @@ def cli_simulate(kp: float = 0.5,
     print(f"  - Step Speed: {round(vi, 2)} m/s ({vi * 3.6} km/h)")
     print(f"  - Windup Protection: {windup_protection}")
     print(f"  - Road Inclinations: {road_inclinations}")
+    print(f"  - Fast-forward: {fast_forward}")
 
     camry_xse_2025 = Vehicle(mass=1_604,
                              drag_coefficient=0.28,
@@ -46,7 +48,8 @@ def cli_simulate(kp: float = 0.5,
                           control=ecu,
                           inclination_generator=RoadInclinationGenerator() if road_inclinations else None,
                           initial_speed=0,
-                          total_time=simulation_time
+                          total_time=simulation_time,
+                          fast_forward=fast_forward,
                           )
 
 
@@ -78,10 +81,14 @@ def prompt_simulation_parameters() -> tuple[SimulationResult, float]:
     print("\n[blue]Disturbance Options[/blue]:")
     generate_road_inclinations: bool = typer.confirm("Generate Road Inclinations?", default=False)
 
+    print("\n[blue]Simulation Options[/blue]:")
+    fast_forward: bool = typer.confirm("Fast-forward settled cruising?", default=False)
+
     return cli_simulate(vi=vi,
                         kp=kp, ki=ki, kd=kd, windup_protection=use_windup,
                         road_inclinations=generate_road_inclinations,
                         simulation_time=tf,
+                        fast_forward=fast_forward,
                         ), vi
 
 
@@ -114,6 +121,8 @@ def cli(
 
     print("\n[magenta]Variables over time[/magenta]:")
     print(result.df().describe())
+    if result.jumps:
+        print(f"\nFast-forward measured speedup: {result.speedup():.2f}x ({result.jumps} jumps)")
     print(CONSOLE_BANNER)
     plot_results(result, step_speed=vi * 3.6, save=True)
     print("Results saved. Check the 'output/' directory.")
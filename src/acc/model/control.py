@@ -57,3 +57,36 @@ class EngineControlUnit:
         self._previous_error = error
 
         return output
+
+    def state(self) -> tuple[float, float]:
+        """
+        The internal state of the controller.
+
+        Returns:
+            The integral of the error and the previous error signal
+        """
+        return self._integral, self._previous_error
+
+    def etc_batch(self, errors: np.ndarray, dt: float) -> np.ndarray:
+        """
+        Processes a series of error signals at once, as if `etc` was called for each of them.
+
+        The result is exact without windup protection. With windup protection, it is exact as long as the output does
+        not saturate.
+
+        Args:
+            errors: the error signals
+            dt: time step
+
+        Returns:
+            The control signals, with values between [-1, 1]
+        """
+        integral = self._integral + np.concatenate(([0.0], np.cumsum(errors[:-1]) * dt))
+        derivative = np.diff(errors, prepend=self._previous_error) / dt
+
+        output = np.clip((self.kp * errors + self.ki * integral + self.kd * derivative) * PID_GAIN, -1, 1)
+
+        self._integral = integral[-1] + errors[-1] * dt
+        self._previous_error = errors[-1]
+
+        return output
@@ -10,18 +10,37 @@ import numpy as np
 from acc.utils.constants import SPEEDOMETER_BIAS, SPEEDOMETER_STD, SPEEDOMETER_MAX_READING, SPEEDOMETER_MIN_READING
 
 
-def speedometer(vo: float) -> float:
+def speedometer(vo: float, noise: float | None = None) -> float:
     """
     Simulate the speedometer sensor.
 
     Args:
         vo: the plant output, the speed of the vehicle in m/s
+        noise: an already drawn reading error in m/s, a new one is drawn if None
 
     Returns:
         f: the speedometer reading in m/s
     """
 
     # The speedometer sensor is not perfect.
-    error = np.random.normal(SPEEDOMETER_BIAS, SPEEDOMETER_STD)
-    factor = np.random.choice([1, -1])
-    return np.clip(vo + factor * error, SPEEDOMETER_MIN_READING, SPEEDOMETER_MAX_READING)
+    if noise is None:
+        error = np.random.normal(SPEEDOMETER_BIAS, SPEEDOMETER_STD)
+        factor = np.random.choice([1, -1])
+        noise = factor * error
+
+    return np.clip(vo + noise, SPEEDOMETER_MIN_READING, SPEEDOMETER_MAX_READING)
+
+
+def speedometer_noise(size: int) -> np.ndarray:
+    """
+    Draw a batch of speedometer reading errors, with the same statistics as `speedometer`.
+
+    Args:
+        size: number of readings
+
+    Returns:
+        the errors to add to the plant output, in m/s
+    """
+    error = np.random.normal(SPEEDOMETER_BIAS, SPEEDOMETER_STD, size)
+    factor = np.random.choice([1, -1], size)
+    return factor * error
@@ -44,7 +44,13 @@ class Vehicle(BaseModel):
     gear: int = 1  # dimensionless
 
 
-def process(vehicle: Vehicle, throttle: float, dt: float, theta: float = 0.0, mu: float = 0.01) -> float:
+def process(vehicle: Vehicle,
+            throttle: float,
+            dt: float,
+            theta: float = 0.0,
+            mu: float = 0.01,
+            sua_probability: float = p_sua,
+            disturbance: float = 0.0) -> float:
     """
     Simulate vehicle dynamics updating its position and speed.
 
@@ -54,12 +60,51 @@ def process(vehicle: Vehicle, throttle: float, dt: float, theta: float = 0.0, mu
         dt: time step
         theta: inclination angle of the road
         mu: coefficient of rolling friction
+        sua_probability: probability of a sudden unintended acceleration during this step
+        disturbance: external force opposing the motion (N)
 
     Returns:
         Vo, the new speed of the vehicle in m/s
     """
-    m = vehicle.mass  # Kg
     v = vehicle.speed  # m/s
+
+    # from: a = F/m
+    a = acceleration(vehicle, v, throttle, theta=theta, mu=mu, disturbance=disturbance)
+
+    # Sudden Unintended Acceleration (SUA) disturbance
+    sua = sudden_unintended_acceleration(a, probability=sua_probability)
+    a += sua
+
+    # Update vehicle position and speed
+    # v = v0 + a * t
+    vo = v + a * dt
+    vehicle.position += v * dt
+    vehicle.speed = vo
+
+    return vo
+
+
+def acceleration(vehicle: Vehicle,
+                 v: float,
+                 throttle: float,
+                 theta: float = 0.0,
+                 mu: float = 0.01,
+                 disturbance: float = 0.0) -> float:
+    """
+    Calculate the acceleration of the vehicle, without the SUA disturbance, from the balance of forces.
+
+    Args:
+        vehicle: a dynamic model
+        v: speed of the vehicle in m/s
+        throttle: percentage of throttle input
+        theta: inclination angle of the road
+        mu: coefficient of rolling friction
+        disturbance: external force opposing the motion (N)
+
+    Returns:
+        the acceleration of the vehicle in m/s^2
+    """
+    m = vehicle.mass  # Kg
     area = vehicle.frontal_area  # m^2
     alpha = vehicle.gear_ratio[vehicle.gear - 1] / vehicle.wheel_radius  # m^-1
 
@@ -79,22 +124,69 @@ def process(vehicle: Vehicle, throttle: float, dt: float, theta: float = 0.0, mu
     fa = 0.5 * vehicle.drag_coefficient * area * air_density * abs(v) * v
 
     # Total disturbance force
-    fd = fg + fr + fa
+    fd = fg + fr + fa + disturbance
 
-    # from: a = F/m
-    a = (f - fd) / m
+    return (f - fd) / m
 
-    # Sudden Unintended Acceleration (SUA) disturbance
-    sua = sudden_unintended_acceleration(a)
-    a += sua
 
-    # Update vehicle position and speed
-    # v = v0 + a * t
-    vo = v + a * dt
-    vehicle.position += v * dt
-    vehicle.speed = vo
+def equilibrium_throttle(vehicle: Vehicle, theta: float = 0.0, mu: float = 0.01, disturbance: float = 0.0) -> float:
+    """
+    Calculate the throttle that holds the current speed of the vehicle.
 
-    return vo
+    Args:
+        vehicle: a dynamic model
+        theta: inclination angle of the road
+        mu: coefficient of rolling friction
+        disturbance: external force opposing the motion (N)
+
+    Returns:
+        The throttle with no acceleration, not limited to [-1, 1]. 0 if the throttle has no effect.
+    """
+    v = vehicle.speed
+
+    a0 = acceleration(vehicle, v, 0.0, theta=theta, mu=mu, disturbance=disturbance)
+    a_u = acceleration(vehicle, v, 1.0, theta=theta, mu=mu, disturbance=disturbance) - a0
+
+    return -a0 / a_u if a_u else 0.0
+
+
+def linearize(vehicle: Vehicle,
+              dt: float,
+              theta: float = 0.0,
+              mu: float = 0.01,
+              disturbance: float = 0.0,
+              h: float = 1e-3) -> tuple[float, float, float]:
+    """
+    Linearize the vehicle dynamics around its current speed and the throttle that holds it.
+
+    The step v(t + dt) = v + a(v, u) dt is approximated by v(t + dt) ≈ p v + q u + r. The acceleration is affine in the
+    throttle, so only the speed dependency is approximated (central differences of step `h`).
+
+    Args:
+        vehicle: a dynamic model
+        dt: time step
+        theta: inclination angle of the road
+        mu: coefficient of rolling friction
+        disturbance: external force opposing the motion (N)
+        h: speed step for the numerical derivative (m/s)
+
+    Returns:
+        The (p, q, r) coefficients of the linear step
+    """
+    v = vehicle.speed
+
+    a0 = acceleration(vehicle, v, 0.0, theta=theta, mu=mu, disturbance=disturbance)
+    a_u = acceleration(vehicle, v, 1.0, theta=theta, mu=mu, disturbance=disturbance) - a0
+    u = equilibrium_throttle(vehicle, theta=theta, mu=mu, disturbance=disturbance)
+
+    a_v = (acceleration(vehicle, v + h, u, theta=theta, mu=mu, disturbance=disturbance)
+           - acceleration(vehicle, v - h, u, theta=theta, mu=mu, disturbance=disturbance)) / (2 * h)
+
+    p = 1 + a_v * dt
+    q = a_u * dt
+    r = v + (a0 + a_u * u) * dt - p * v - q * u
+
+    return p, q, r
 
 
 def motor_torque(vehicle: Vehicle, omega: float) -> float:
@@ -116,12 +208,13 @@ def motor_torque(vehicle: Vehicle, omega: float) -> float:
     return max(tm * (1 - beta * (omega / omega_m - 1) ** 2), 0)
 
 
-def sudden_unintended_acceleration(a: float) -> float:
+def sudden_unintended_acceleration(a: float, probability: float = p_sua) -> float:
     """
     Simulates an unintended increment in acceleration.
 
     Args:
         a: acceleration in m/s^2
+        probability: probability of the disturbance
 
     Returns:
         Either an increase of 25% to 45% using a uniform distribution. Or 0.
@@ -129,7 +222,7 @@ def sudden_unintended_acceleration(a: float) -> float:
     r = random.uniform(0, 1)
     increment = random.uniform(0.25, 0.45)
 
-    return a * increment if r <= p_sua else 0
+    return a * increment if r <= probability else 0
 
 
 def tcu(vehicle: Vehicle, v: float) -> int:
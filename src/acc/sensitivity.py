@@ -0,0 +1,245 @@
+"""
+Global sensitivity analysis of the CC system over the vehicle parameters.
+
+Sobol indices are estimated with the Saltelli sampling scheme over a scrambled Sobol sequence, using the Saltelli
+(first-order) and Jansen (total) estimators. Each sample is an independent simulation, evaluated in a process pool.
+"""
+import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from math import floor, log2
+
+import numpy as np
+from pydantic import BaseModel
+from scipy.stats import qmc
+
+from acc.model.control import EngineControlUnit
+from acc.model.process import Vehicle
+from acc.simulation import run_simulation
+from acc.utils.rv import RoadInclinationGenerator
+from acc.utils.trace import DriveCycle
+
+PARAMETERS = ('mass', 'drag_coefficient', 'frontal_area', 'torque_max', 'omega_max', 'gear_ratio')
+OUTPUTS = ('error', 'throttle')
+
+
+class SensitivityIndices(BaseModel):
+    """
+    Sobol indices of a single output
+
+    Attributes:
+        first_order: first-order index of each parameter
+        first_order_interval: bootstrap confidence interval of each first-order index
+        total: total index of each parameter
+        total_interval: bootstrap confidence interval of each total index
+    """
+    first_order: dict[str, float]
+    first_order_interval: dict[str, tuple[float, float]]
+    total: dict[str, float]
+    total_interval: dict[str, tuple[float, float]]
+
+
+class SensitivityResult(BaseModel):
+    """
+    Sensitivity Analysis Result
+
+    Attributes:
+        bounds: sampled range of each parameter, `gear_ratio` is a factor over all the gear ratios
+        samples: number of base samples
+        evaluations: number of simulations run
+        indices: Sobol indices of each output, the mean absolute error (km/h) and the mean absolute throttle
+    """
+    bounds: dict[str, tuple[float, float]]
+    samples: int
+    evaluations: int
+    indices: dict[str, SensitivityIndices]
+
+
+def parameter_bounds(vehicle: Vehicle, spread: float = 0.2) -> dict[str, tuple[float, float]]:
+    """
+    Ranges of the vehicle parameters around their nominal values.
+
+    Args:
+        vehicle: the nominal dynamic model
+        spread: relative deviation from the nominal value
+
+    Returns:
+        The (low, high) range of each parameter
+    """
+    nominal = {name: 1.0 if name == 'gear_ratio' else getattr(vehicle, name) for name in PARAMETERS}
+    return {name: (value * (1 - spread), value * (1 + spread)) for name, value in nominal.items()}
+
+
+def sobol_analysis(vehicle: Vehicle,
+                   vi: float,
+                   control: EngineControlUnit,
+                   budget: int = 1_024,
+                   bounds: dict[str, tuple[float, float]] | None = None,
+                   initial_speed: float = 0.0,
+                   total_time: float = 600.0,
+                   road_inclinations: bool = False,
+                   fast_forward: bool = False,
+                   trace: DriveCycle | None = None,
+                   bootstrap: int = 500,
+                   confidence: float = 0.95,
+                   seed: int = 0,
+                   workers: int | None = None,
+                   ) -> SensitivityResult:
+    """
+    Estimate the Sobol indices of the tracking error and the throttle effort over the vehicle parameters.
+
+    The budget is split into N (A, B and one AB matrix per parameter) with N a power of two, so the number of
+    simulations never exceeds it. Rows of the same base sample share their random seed, so noise, SUA and road
+    disturbances are common to the compared evaluations. With `fast_forward` this no longer holds: where the jumps
+    start depends on the parameters, so the random streams of the rows drift apart, and the indices are estimated on
+    the linearized approximation of the settled segments.
+
+    Args:
+        vehicle: the nominal dynamic model
+        vi: step input speed
+        control: ECU controller, each evaluation starts from a fresh copy of its gains
+        budget: maximum number of simulations
+        bounds: range of the parameters to analyze, defaults to `parameter_bounds(vehicle)`
+        initial_speed: initial speed of the vehicle
+        total_time: simulated time of each evaluation
+        road_inclinations: generate road inclinations in each evaluation
+        fast_forward: jump through settled cruising segments, faster but without common random numbers
+        trace: drive cycle replayed in each evaluation, memory-mapped by every worker
+        bootstrap: number of bootstrap resamples for the confidence intervals
+        confidence: confidence level of the intervals
+        seed: seed of the sampler, the simulations and the bootstrap
+        workers: number of worker processes, defaults to the number of processors. 1 runs in the current process.
+
+    Returns:
+        The first-order and total indices of each output
+    """
+    bounds = bounds or parameter_bounds(vehicle)
+    names = list(bounds)
+    d = len(names)
+
+    if budget < 2 * (d + 2):
+        raise ValueError(f"A budget of at least {2 * (d + 2)} simulations is required for {d} parameters")
+
+    n = 2 ** floor(log2(budget // (d + 2)))
+
+    sampler = qmc.Sobol(d=2 * d, scramble=True, seed=seed)
+    low, high = zip(*bounds.values())
+    samples = qmc.scale(sampler.random(n), low * 2, high * 2)
+    a, b = samples[:, :d], samples[:, d:]
+
+    ab = np.repeat(a[np.newaxis], d, axis=0)
+    for i in range(d):
+        ab[i, :, i] = b[:, i]
+
+    rows = np.concatenate([a, b, *ab])
+    seeds = np.tile(np.arange(n) + seed, d + 2).tolist()
+
+    evaluate = partial(_evaluate,
+                       names=names,
+                       vehicle=vehicle,
+                       vi=vi,
+                       control=control,
+                       initial_speed=initial_speed,
+                       total_time=total_time,
+                       road_inclinations=road_inclinations,
+                       fast_forward=fast_forward,
+                       trace=trace)
+
+    if workers == 1:
+        outputs = list(map(evaluate, rows, seeds))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outputs = list(pool.map(evaluate, rows, seeds, chunksize=max(1, n // 4)))
+
+    outputs = np.array(outputs).reshape(d + 2, n, len(OUTPUTS))
+    rng = np.random.default_rng(seed)
+    resamples = rng.integers(0, n, size=(bootstrap, n))
+
+    indices = {}
+    for k, output in enumerate(OUTPUTS):
+        f_a, f_b, f_ab = outputs[0, :, k], outputs[1, :, k], outputs[2:, :, k]
+
+        first_order, total = _sobol_indices(f_a, f_b, f_ab)
+        first_order_samples, total_samples = _sobol_indices(f_a[resamples], f_b[resamples], f_ab[:, resamples])
+
+        indices[output] = SensitivityIndices(
+            first_order=dict(zip(names, first_order.tolist())),
+            first_order_interval=dict(zip(names, _interval(first_order_samples, confidence))),
+            total=dict(zip(names, total.tolist())),
+            total_interval=dict(zip(names, _interval(total_samples, confidence))),
+        )
+
+    return SensitivityResult(bounds=bounds, samples=n, evaluations=len(rows), indices=indices)
+
+
+def _evaluate(values: np.ndarray,
+              seed: int,
+              names: list[str],
+              vehicle: Vehicle,
+              vi: float,
+              control: EngineControlUnit,
+              initial_speed: float,
+              total_time: float,
+              road_inclinations: bool,
+              fast_forward: bool,
+              trace: DriveCycle | None,
+              ) -> tuple[float, float]:
+    """
+    Simulate a vehicle with the sampled parameters.
+
+    Returns:
+        The mean absolute error (km/h) and the mean absolute throttle
+    """
+    update = dict(zip(names, values.tolist()))
+    if 'gear_ratio' in update:
+        update['gear_ratio'] = [ratio * update['gear_ratio'] for ratio in vehicle.gear_ratio]
+
+    np.random.seed(seed)
+    random.seed(seed)
+
+    result = run_simulation(vehicle=vehicle.model_copy(update=update),
+                            vi=vi,
+                            control=EngineControlUnit(kp=control.kp,
+                                                      ki=control.ki,
+                                                      kd=control.kd,
+                                                      windup_protection=control.windup_protection),
+                            initial_speed=initial_speed,
+                            total_time=total_time,
+                            inclination_generator=RoadInclinationGenerator(time_limit=int(total_time))
+                            if road_inclinations else None,
+                            fast_forward=fast_forward,
+                            trace=trace,
+                            )
+
+    return float(np.mean(np.abs(result.errors))), float(np.mean(np.abs(result.throttle)))
+
+
+def _sobol_indices(f_a: np.ndarray, f_b: np.ndarray, f_ab: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Saltelli (2010) first-order and Jansen total estimators, over the last axis of the evaluations.
+
+    Args:
+        f_a: evaluations of the A matrix
+        f_b: evaluations of the B matrix
+        f_ab: evaluations of each AB matrix, one per parameter on the first axis
+
+    Returns:
+        The first-order and total indices, with the parameters on the last axis
+    """
+    f = np.concatenate([f_a, f_b], axis=-1)
+    mean, variance = np.mean(f, axis=-1, keepdims=True), np.var(f, axis=-1)
+
+    # Centering the outputs does not change the indices, but reduces the variance of the first-order estimator
+    first_order = np.mean((f_b - mean) * (f_ab - f_a), axis=-1) / variance
+    total = 0.5 * np.mean((f_a - f_ab) ** 2, axis=-1) / variance
+
+    return np.moveaxis(first_order, 0, -1), np.moveaxis(total, 0, -1)
+
+
+def _interval(samples: np.ndarray, confidence: float) -> list[tuple[float, float]]:
+    """
+    Percentile confidence interval of each parameter, from its bootstrap samples.
+    """
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(samples, [tail, 100 - tail], axis=0)
+    return list(zip(low.tolist(), high.tolist()))
@@ -1,13 +1,38 @@
 """
 Simulation module for the CC system.
 """
+import dataclasses
+from time import perf_counter
+
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel
+from scipy.signal import lfilter
 
 from acc.model.control import EngineControlUnit
-from acc.model.feedback import speedometer
-from acc.model.process import Vehicle, process, tcu
+from acc.model.feedback import speedometer, speedometer_noise
+from acc.model.process import Vehicle, equilibrium_throttle, linearize, process, tcu
+from acc.utils.constants import (FAST_FORWARD_MIN_STEPS, PID_GAIN, SETTLE_TOLERANCE, SPEEDOMETER_MAX_READING,
+                                 SPEEDOMETER_MIN_READING, SPEEDOMETER_STD, p_sua)
 from acc.utils.rv import RoadInclinationGenerator
+from acc.utils.trace import DriveCycle
+
+
+@dataclasses.dataclass
+class _Jump:
+    """
+    Outcome of a fast-forward attempt
+
+    Attributes:
+        steps: number of time steps advanced
+        sua_due: a SUA must happen on the following step
+        noise: speedometer error of the following step, if already drawn
+        retry: earliest time of the next attempt, unless the gear changes
+    """
+    steps: int = 0
+    sua_due: bool = False
+    noise: float | None = None
+    retry: int = 0
 
 
 class SimulationResult(BaseModel):
@@ -18,6 +43,12 @@ class SimulationResult(BaseModel):
         times: time vector
         errors: error vector
         speeds: speed vector
+        steps: number of individually simulated time steps
+        jumps: number of fast-forward jumps through settled cruising
+        step_time: wall time of the individually simulated time steps (s)
+        cruise_steps: individually simulated time steps without a road disturbance
+        cruise_step_time: wall time of the time steps without a road disturbance (s)
+        fast_forward_time: wall time of the fast-forward jumps and attempts (s)
     """
     times: list[float] = []
     errors: list[float] = []
@@ -26,6 +57,12 @@ class SimulationResult(BaseModel):
     gears: list[int] = []
     throttle: list[float] = []
     speedometer: list[float] = []
+    steps: int = 0
+    jumps: int = 0
+    step_time: float = 0.0
+    cruise_steps: int = 0
+    cruise_step_time: float = 0.0
+    fast_forward_time: float = 0.0
 
     def df(self) -> pd.DataFrame:
         """
@@ -41,6 +78,24 @@ class SimulationResult(BaseModel):
             'Speedometer': self.speedometer,
         })
 
+    def speedup(self) -> float:
+        """
+        Measured wall-time speedup of the fast-forward mode.
+
+        The time to simulate the jumped steps individually is extrapolated from the mean time of the steps without a
+        road disturbance, the only kind a jump goes through, and compared to the time spent on the jumps and on the
+        attempts that did not jump.
+
+        Returns:
+            The estimated time of simulating every step over the actual time, 1.0 if there is nothing to compare
+        """
+        elapsed = self.step_time + self.fast_forward_time
+        if not self.cruise_steps or not elapsed:
+            return 1.0
+
+        jumped = len(self.times) - self.steps
+        return (self.step_time + self.cruise_step_time / self.cruise_steps * jumped) / elapsed
+
 
 def run_simulation(vehicle: Vehicle,
                    vi: float,
@@ -49,35 +104,67 @@ def run_simulation(vehicle: Vehicle,
                    total_time: float = 3_600.0,
                    dt: float = 1.0,
                    inclination_generator: RoadInclinationGenerator | None = None,
+                   fast_forward: bool = False,
+                   settle_tolerance: float = SETTLE_TOLERANCE,
+                   trace: DriveCycle | None = None,
                    ) -> SimulationResult:
     """
     Run the simulation of the CC system
 
     Args:
         vehicle: a dynamic model
-        vi: step input speed
+        vi: step input speed, replaced by the setpoints of the trace if given
         control: ECU controller
         initial_speed: initial speed of the vehicle
         total_time: total simulation time
         dt: time step
         inclination_generator: road inclination generator
-        
+        fast_forward: jump through settled cruising segments instead of simulating each step
+        settle_tolerance: maximum speed error (m/s) to consider the cruise settled
+        trace: drive cycle to replay, providing the setpoint, road grade and disturbance force of each time step
+
     Returns:
         Time series of the simulation
     """
+    if trace is not None and len(trace) < int(total_time):
+        raise ValueError(f"The drive cycle has {len(trace)} time steps, {int(total_time)} are required")
+
     subject = vehicle.model_copy(update={'speed': initial_speed, 'position': 0})
 
     result = SimulationResult()
 
-    for t in range(int(total_time)):
+    steps = int(total_time)
+    force_sua = False
+    noise = None
+    retry, retry_gear = 0, subject.gear
+    t = 0
+
+    while t < steps:
+        start = perf_counter()
+        setpoint, grade, disturbance = trace.inputs(t) if trace is not None else (vi, 0.0, 0.0)
+
+        if fast_forward and not force_sua and noise is None and (t >= retry or subject.gear != retry_gear):
+            jump = _fast_forward(subject, setpoint, control, t, steps, dt, inclination_generator,
+                                 trace, grade, disturbance, settle_tolerance, result)
+            force_sua, noise, retry, retry_gear = jump.sua_due, jump.noise, jump.retry, subject.gear
+
+            now = perf_counter()
+            result.fast_forward_time += now - start
+            start = now
+
+            if jump.steps:
+                result.jumps += 1
+                t += jump.steps
+                continue
+
         # [Vo] - Output: plant velocity
         vo = subject.speed
 
         # [f(t)] - Feedback Element: Speedometer reading signal (f)
-        f = speedometer(vo)
+        f = speedometer(vo, noise=noise)
 
         # [e(t)] - Summing Point: Error signal
-        error = vi - f
+        error = setpoint - f
 
         # u(t) - Control Element: ECU control signal obtained from ETC actuator.
         u = control.etc(error, dt)
@@ -85,10 +172,11 @@ def run_simulation(vehicle: Vehicle,
         # gear shifting
         subject.gear = tcu(subject, f)
 
-        theta = inclination_generator.next_inclination(t) if inclination_generator else 0
+        theta = grade + (inclination_generator.next_inclination(t) if inclination_generator else 0)
 
         # vo(t) - Process: Vehicle Dynamics
-        vo = process(subject, throttle=u, dt=dt, theta=theta)
+        vo = process(subject, throttle=u, dt=dt, theta=theta, sua_probability=1.0 if force_sua else p_sua,
+                     disturbance=disturbance)
 
         # save series
         result.times.append(t)
@@ -99,4 +187,173 @@ def run_simulation(vehicle: Vehicle,
         result.speedometer.append(f * 3.6)
         result.inclinations.append(theta)
 
+        elapsed = perf_counter() - start
+        result.steps += 1
+        result.step_time += elapsed
+        if not (inclination_generator and inclination_generator.is_disturbance(t)):
+            result.cruise_steps += 1
+            result.cruise_step_time += elapsed
+
+        force_sua = False
+        noise = None
+        t += 1
+
     return result
+
+
+def _fast_forward(subject: Vehicle,
+                  vi: float,
+                  control: EngineControlUnit,
+                  t: int,
+                  steps: int,
+                  dt: float,
+                  inclination_generator: RoadInclinationGenerator | None,
+                  trace: DriveCycle | None,
+                  grade: float,
+                  disturbance: float,
+                  settle_tolerance: float,
+                  result: SimulationResult,
+                  ) -> _Jump:
+    """
+    Advance through a settled cruising segment in a single jump.
+
+    The cruise is settled when the speed error is inside the tolerance, no gear shift is due, the throttle has room to
+    absorb the speedometer noise, and the inputs stay constant until the next scheduled disturbance or drive cycle
+    change. Around that point the closed loop is linear, so the whole segment is solved at once from a batch of
+    speedometer noise. The jump stops before the next disturbance, before the next SUA, or as soon as the solution
+    leaves the settled region (error, gear range or throttle saturation). The speedometer error that ends the segment
+    is handed over to the following step, so leaving the jump does not bias the readings.
+
+    A jump costs about as much as `FAST_FORWARD_MIN_STEPS` individual steps, so shorter segments are simulated step by
+    step. When the segment is too short or the throttle has no room, nothing changes until the next event or gear
+    shift, so the next attempt is delayed until then.
+
+    Args:
+        subject: the simulated vehicle, updated in place
+        vi: speed setpoint
+        control: ECU controller, updated in place
+        t: current time
+        steps: total number of time steps
+        dt: time step
+        inclination_generator: road inclination generator
+        trace: replayed drive cycle
+        grade: road grade of the drive cycle (degrees)
+        disturbance: disturbance force of the drive cycle (N)
+        settle_tolerance: maximum speed error (m/s) to consider the cruise settled
+        result: time series, extended in place
+
+    Returns:
+        The outcome of the attempt
+    """
+    v = subject.speed
+
+    if v <= 0 or abs(vi - v) > settle_tolerance or tcu(subject, v) != subject.gear:
+        return _Jump(retry=t + 1)
+
+    if result.throttle and abs(result.throttle[-1]) >= 1:
+        return _Jump(retry=t + 1)
+
+    events = [inclination_generator.next_event(t) if inclination_generator else None,
+              trace.next_change(t) if trace is not None else None]
+    end = min([event for event in events if event is not None] + [steps])
+    if end - t < FAST_FORWARD_MIN_STEPS:
+        return _Jump(retry=end)
+
+    theta = grade + (inclination_generator.next_inclination(t) if inclination_generator else 0)
+    kc = PID_GAIN * (control.kp + control.kd / dt)
+
+    # The throttle that holds the speed must leave room for the speedometer noise, or it saturates
+    if abs(equilibrium_throttle(subject, theta=theta, disturbance=disturbance)) + 3 * kc * SPEEDOMETER_STD >= 1:
+        return _Jump(retry=end)
+
+    # Steps until the next Sudden Unintended Acceleration
+    sua_wait = int(np.random.geometric(p_sua)) - 1
+    if sua_wait == 0:
+        return _Jump(sua_due=True, retry=t + 1)
+    n = min(end - t, sua_wait)
+    if n < FAST_FORWARD_MIN_STEPS:
+        return _Jump(retry=t + 1)
+
+    # Closed loop state x = (v, ∫e, e_prev), with e = vi - v - noise and v(t + dt) ≈ p v + q u + r
+    p, q, r = linearize(subject, dt, theta=theta, disturbance=disturbance)
+    ki = PID_GAIN * control.ki
+    kd = PID_GAIN * control.kd / dt
+
+    a = np.array([[p - q * kc, q * ki, -q * kd],
+                  [-dt, 1.0, 0.0],
+                  [-1.0, 0.0, 0.0]])
+    b = np.array([-q * kc, -dt, -1.0])
+    d = np.array([q * kc * vi + r, dt * vi, vi])
+    x0 = np.array([v, *control.state()])
+
+    noise = speedometer_noise(n)
+    x = _closed_loop_response(a, b, d, x0, noise)
+    if x is None:
+        return _Jump(retry=end)
+
+    speeds, integrals, previous_errors = x.T
+    readings = np.clip(speeds[:-1] + noise, SPEEDOMETER_MIN_READING, SPEEDOMETER_MAX_READING)
+    errors = vi - readings
+    throttle = kc * errors + ki * integrals[:-1] - kd * previous_errors[:-1]
+
+    low, high = (limit / 3.6 for limit in subject.gear_speed_ranges[subject.gear - 1])
+    settled = ((np.abs(throttle) < 1)
+               & (low < readings) & (readings < high)
+               & (np.abs(vi - speeds[1:]) <= settle_tolerance))
+    jump = n if settled.all() else int(np.argmin(settled))
+    pending = float(noise[jump]) if jump < n else None
+    if jump == 0:
+        return _Jump(noise=pending, retry=t + 1)
+
+    errors, readings, speeds = errors[:jump], readings[:jump], speeds[:jump + 1]
+    throttle = control.etc_batch(errors, dt)
+
+    subject.position += float(speeds[:-1].sum() * dt)
+    subject.speed = float(speeds[-1])
+
+    result.times.extend(range(t, t + jump))
+    result.errors.extend((errors * 3.6).tolist())
+    result.speeds.extend((speeds[1:] * 3.6).tolist())
+    result.gears.extend([subject.gear] * jump)
+    result.throttle.extend(throttle.tolist())
+    result.speedometer.extend((readings * 3.6).tolist())
+    result.inclinations.extend([theta] * jump)
+
+    return _Jump(steps=jump, sua_due=jump == sua_wait, noise=pending, retry=t + jump)
+
+
+def _closed_loop_response(a: np.ndarray,
+                          b: np.ndarray,
+                          d: np.ndarray,
+                          x0: np.ndarray,
+                          w: np.ndarray,
+                          max_condition: float = 1e8,
+                          ) -> np.ndarray | None:
+    """
+    Solve x(k + 1) = A x(k) + b w(k) + d in closed form, decoupling the system into its modes.
+
+    Args:
+        a: state matrix
+        b: input vector
+        d: constant input vector
+        x0: initial state
+        w: input series
+        max_condition: maximum condition number of the modal basis to trust the solution
+
+    Returns:
+        The states x(0) ... x(n), None if the system can not be reliably decoupled
+    """
+    eigenvalues, basis = np.linalg.eig(a)
+    if np.linalg.cond(basis) > max_condition:
+        return None
+
+    inverse = np.linalg.inv(basis)
+    z0, zb, zd = inverse @ x0, inverse @ b, inverse @ d
+
+    modes = np.empty((len(w) + 1, len(eigenvalues)), dtype=complex)
+    for i, eigenvalue in enumerate(eigenvalues):
+        # z(k + 1) = λ z(k) + s(k), seeded with the initial state
+        s = np.concatenate(([z0[i]], zb[i] * w + zd[i]))
+        modes[:, i] = lfilter([1.0], [1.0, -eigenvalue], s)
+
+    return (modes @ basis.T).real
@@ -16,6 +16,8 @@ SPEEDOMETER_MIN_READING = 0.0  # m/s
 # Simulation constants
 DEFAULT_SPEED = 30.0  # m/s
 PID_GAIN = 0.1
+SETTLE_TOLERANCE = 0.5  # m/s, maximum speed error to consider the cruise settled
+FAST_FORWARD_MIN_STEPS = 16  # shortest settled segment worth a fast-forward jump, about the cost of one jump
 
 # Print Constants
 CONSOLE_BANNER = "[yellow]==============================================[/yellow]"
@@ -1,6 +1,8 @@
 """
 Random Variables utilities
 """
+from bisect import bisect_left
+
 import numpy as np
 from scipy.stats import maxwell, truncnorm, semicircular
 
@@ -86,6 +88,41 @@ class RoadInclinationGenerator:
 
         return self.last_inclination
 
+    def is_disturbance(self, time: int) -> bool:
+        """
+        Whether the inclination changes randomly at `time`.
+
+        Args:
+            time: current time
+
+        Returns:
+            True if `time` is one of the disturbance intervals
+        """
+        index = bisect_left(self._intervals, time)
+        return index < len(self._intervals) and self._intervals[index] == time
+
+    def next_event(self, time: int) -> int | None:
+        """
+        Time of the next possible change of inclination, at or after `time`.
+
+        Args:
+            time: current time
+
+        Returns:
+            The time of the next disturbance or road level recovery, None if the inclination stays constant from now on.
+        """
+        events = []
+
+        recovery = self.last_time + self._time_rate + 1
+        if recovery >= time:
+            events.append(recovery)
+
+        index = bisect_left(self._intervals, time)
+        if index < len(self._intervals):
+            events.append(self._intervals[index])
+
+        return min(events, default=None)
+
     def _level_angle(self, theta: float) -> float:
         if abs(theta) <= self._angle_rate:
             return 0
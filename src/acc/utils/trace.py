@@ -0,0 +1,116 @@
+"""
+Drive cycle traces utilities
+
+A drive cycle is a recorded series of simulation inputs, one record per time step: the speed setpoint (m/s), the road
+grade (degrees) and an external disturbance force (N). Traces are stored as `.npy` files of `TRACE_DTYPE` records and
+memory-mapped read-only, so long cycles are paged in on demand and shared by every process replaying them.
+"""
+from os import PathLike
+from pathlib import Path
+
+import numpy as np
+
+TRACE_DTYPE = np.dtype([('setpoint', '<f4'), ('grade', '<f4'), ('disturbance', '<f4')])
+
+
+def save_drive_cycle(path: str | PathLike,
+                     setpoint: np.ndarray,
+                     grade: np.ndarray | None = None,
+                     disturbance: np.ndarray | None = None,
+                     ) -> 'DriveCycle':
+    """
+    Store a drive cycle trace.
+
+    Args:
+        path: destination `.npy` file
+        setpoint: speed setpoint of each time step (m/s)
+        grade: road grade of each time step (degrees), flat if None
+        disturbance: external force opposing the motion at each time step (N), none if None
+
+    Returns:
+        The stored trace, memory-mapped
+    """
+    size = len(setpoint)
+
+    trace = np.lib.format.open_memmap(path, mode='w+', dtype=TRACE_DTYPE, shape=(size,))
+    trace['setpoint'] = setpoint
+    trace['grade'] = 0.0 if grade is None else grade
+    trace['disturbance'] = 0.0 if disturbance is None else disturbance
+    trace.flush()
+    del trace
+
+    return DriveCycle(path)
+
+
+class DriveCycle:
+    """
+    Read-only, memory-mapped drive cycle trace.
+
+    Pickling only carries the file path, so process-pool workers map the same file instead of receiving a copy.
+
+    Attributes:
+        path: the `.npy` trace file
+    """
+
+    def __init__(self, path: str | PathLike):
+        self.path = Path(path)
+        self._trace = np.load(self.path, mmap_mode='r')
+        self._change = (0, 0)
+
+        if self._trace.dtype != TRACE_DTYPE or self._trace.ndim != 1:
+            raise ValueError(f"{self.path} is not a drive cycle trace of {TRACE_DTYPE} records")
+
+    def __len__(self) -> int:
+        return len(self._trace)
+
+    def __getstate__(self) -> dict:
+        return {'path': self.path}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state['path'])
+
+    def inputs(self, time: int) -> tuple[float, float, float]:
+        """
+        Simulation inputs at a time step.
+
+        Args:
+            time: time step index
+
+        Returns:
+            The speed setpoint (m/s), road grade (degrees) and disturbance force (N)
+        """
+        setpoint, grade, disturbance = self._trace[time].item()
+        return setpoint, grade, disturbance
+
+    def next_change(self, time: int, chunk: int = 4_096) -> int | None:
+        """
+        Time of the next change of the inputs, after `time`.
+
+        The trace is scanned in chunks of growing size, so only the pages up to the change are read.
+
+        Args:
+            time: current time step index
+            chunk: records in the first scanned chunk
+
+        Returns:
+            The first time step with different inputs, None if they stay constant until the end of the trace.
+        """
+        start, end = self._change
+        if start <= time < end:
+            return end if end < len(self._trace) else None
+
+        current = self._trace[time]
+        index = time + 1
+
+        while index < len(self._trace):
+            changed = np.flatnonzero(self._trace[index:index + chunk] != current)
+            if changed.size:
+                self._change = (time, index + int(changed[0]))
+                return self._change[1]
+
+            index += chunk
+            chunk *= 2
+
+        # No change until the end of the trace
+        self._change = (time, len(self._trace))
+        return None
@@ -0,0 +1,14 @@
+import pytest
+
+from acc.model.process import Vehicle
+
+
+@pytest.fixture
+def vehicle() -> Vehicle:
+    return Vehicle(mass=1_604,
+                   drag_coefficient=0.28,
+                   frontal_area=1.94,
+                   torque_max=221,
+                   omega_max=545.3,
+                   gear_speed_ranges=[(0, 10), (10, 30), (30, 50), (50, 70), (70, 100), (100, 130), (130, 160),
+                                      (160, 200)])
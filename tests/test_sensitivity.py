@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from scipy.stats import qmc
+
+from acc.model.control import EngineControlUnit
+from acc.sensitivity import OUTPUTS, PARAMETERS, _sobol_indices, sobol_analysis
+
+
+def test_sobol_indices_of_additive_model():
+    samples = qmc.Sobol(d=6, scramble=True, seed=0).random(4_096)
+    a, b = samples[:, :3], samples[:, 3:]
+    ab = np.repeat(a[np.newaxis], 3, axis=0)
+    for i in range(3):
+        ab[i, :, i] = b[:, i]
+
+    # Var(x1) : Var(2 x2) : Var(0 x3) = 1 : 4 : 0
+    model = lambda x: x[..., 0] + 2 * x[..., 1]
+
+    first_order, total = _sobol_indices(model(a), model(b), model(ab))
+
+    assert first_order == pytest.approx([0.2, 0.8, 0.0], abs=0.02)
+    assert total == pytest.approx([0.2, 0.8, 0.0], abs=0.02)
+
+
+def test_sobol_analysis(vehicle):
+    result = sobol_analysis(vehicle, 20.0, EngineControlUnit(kp=0.5, ki=0.2, kd=1.0), budget=64, total_time=120,
+                            workers=1)
+
+    assert result.evaluations <= 64
+    assert set(result.indices) == set(OUTPUTS)
+
+    for indices in result.indices.values():
+        assert set(indices.first_order) == set(indices.total) == set(PARAMETERS)
+
+        for parameter in PARAMETERS:
+            low, high = indices.first_order_interval[parameter]
+            assert low <= indices.first_order[parameter] <= high
+
+            low, high = indices.total_interval[parameter]
+            assert low <= indices.total[parameter] <= high
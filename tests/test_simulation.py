@@ -0,0 +1,88 @@
+import random
+
+import numpy as np
+import pytest
+
+from acc.model.control import EngineControlUnit
+from acc.simulation import _closed_loop_response, run_simulation
+from acc.utils.rv import RoadInclinationGenerator
+
+
+def seed(value: int):
+    np.random.seed(value)
+    random.seed(value)
+
+
+def test_closed_loop_response_matches_iteration():
+    rng = np.random.default_rng(0)
+    # Stable, with complex eigenvalues as in the PID closed loop
+    a = np.array([[0.5, 0.02, -0.3],
+                  [-1.0, 1.0, 0.0],
+                  [-1.0, 0.0, 0.0]])
+    b, d, x0 = rng.normal(size=3), rng.normal(size=3), rng.normal(size=3)
+    w = rng.normal(size=200)
+
+    expected = [x0]
+    for w_k in w:
+        expected.append(a @ expected[-1] + b * w_k + d)
+
+    assert np.allclose(_closed_loop_response(a, b, d, x0, w), expected)
+
+
+def test_etc_batch_matches_etc():
+    errors = np.random.default_rng(1).normal(size=50)
+    single, batch = EngineControlUnit(kp=0.5, ki=0.2, kd=1.0), EngineControlUnit(kp=0.5, ki=0.2, kd=1.0)
+
+    expected = [single.etc(error, 1.0) for error in errors]
+
+    assert np.allclose(batch.etc_batch(errors, 1.0), expected)
+    assert np.allclose(batch.state(), single.state())
+
+
+def test_full_stepping_reproduces_baseline(vehicle):
+    seed(7)
+
+    result = run_simulation(vehicle, 25.0, EngineControlUnit(kp=0.5, ki=0.2, kd=1.0), total_time=600,
+                            inclination_generator=RoadInclinationGenerator())
+
+    # Series of the simulation before the fast-forward mode was introduced
+    assert sum(result.speeds) == pytest.approx(53928.00555324752)
+    assert sum(result.throttle) == pytest.approx(458.61241519369213)
+    assert sum(result.inclinations) == pytest.approx(17.28318345670939)
+    assert result.steps == 600 and result.jumps == 0
+
+
+@pytest.mark.parametrize('road_inclinations', [False, True])
+def test_fast_forward_matches_full_stepping(vehicle, road_inclinations):
+    statistics = {}
+
+    for fast_forward in (False, True):
+        errors, absolute_errors, deviations, throttle, jumps = [], [], [], [], 0
+
+        for value in range(8):
+            seed(value)
+            result = run_simulation(vehicle, 20.0, EngineControlUnit(kp=0.5, ki=0.2, kd=1.0), total_time=1_800,
+                                    inclination_generator=RoadInclinationGenerator() if road_inclinations else None,
+                                    fast_forward=fast_forward)
+
+            assert result.times == list(range(1_800))
+            errors.append(np.mean(result.errors[600:]))
+            absolute_errors.append(np.mean(np.abs(result.errors[600:])))
+            deviations.append(np.std(result.errors[600:]))
+            throttle.append(np.mean(result.throttle[600:]))
+            jumps += result.jumps
+
+        statistics[fast_forward] = {
+            'error': np.mean(errors),
+            'absolute_error': np.mean(absolute_errors),
+            'error_deviation': np.mean(deviations),
+            'throttle': np.mean(throttle),
+            'jumps': jumps,
+        }
+
+    full, jumped = statistics[False], statistics[True]
+    assert jumped['jumps'] > 0
+    assert jumped['error'] == pytest.approx(full['error'], abs=0.05)
+    assert jumped['absolute_error'] == pytest.approx(full['absolute_error'], abs=0.05)
+    assert jumped['error_deviation'] == pytest.approx(full['error_deviation'], abs=0.05)
+    assert jumped['throttle'] == pytest.approx(full['throttle'], abs=0.01)
@@ -0,0 +1,87 @@
+import pickle
+import random
+
+import numpy as np
+import pytest
+
+from acc.model.control import EngineControlUnit
+from acc.simulation import run_simulation
+from acc.utils.rv import RoadInclinationGenerator
+from acc.utils.trace import DriveCycle, save_drive_cycle
+
+
+@pytest.fixture
+def cycle(tmp_path) -> DriveCycle:
+    setpoint = np.full(1_000, 20.0)
+    setpoint[:100] = 15.0
+    grade = np.zeros(1_000)
+    grade[150:] = 2.0
+
+    return save_drive_cycle(tmp_path / 'cycle.npy', setpoint, grade=grade)
+
+
+def test_save_and_load_drive_cycle(cycle):
+    loaded = DriveCycle(cycle.path)
+
+    assert len(loaded) == 1_000
+    assert loaded.inputs(0) == (15.0, 0.0, 0.0)
+    assert loaded.inputs(120) == (20.0, 0.0, 0.0)
+    assert loaded.inputs(999) == (20.0, 2.0, 0.0)
+
+
+def test_drive_cycle_rejects_other_arrays(tmp_path):
+    path = tmp_path / 'speeds.npy'
+    np.save(path, np.zeros((10, 3)))
+
+    with pytest.raises(ValueError):
+        DriveCycle(path)
+
+
+def test_drive_cycle_pickles_by_path(cycle):
+    data = pickle.dumps(cycle)
+    unpickled = pickle.loads(data)
+
+    assert len(data) < 200
+    assert unpickled.path == cycle.path
+    assert [unpickled.inputs(t) for t in (0, 120, 999)] == [cycle.inputs(t) for t in (0, 120, 999)]
+
+
+def test_next_change(cycle):
+    assert cycle.next_change(0, chunk=4) == 100
+
+    # Inside the cached run
+    assert cycle._change == (0, 100)
+    assert cycle.next_change(50) == 100
+
+    assert cycle.next_change(100) == 150
+    assert cycle.next_change(120) == 150
+
+    # Constant until the end of the trace
+    assert cycle.next_change(150) is None
+    assert cycle._change == (150, 1_000)
+    assert cycle.next_change(500) is None
+    assert cycle.next_change(999) is None
+
+
+def test_run_simulation_rejects_short_trace(vehicle, cycle):
+    with pytest.raises(ValueError):
+        run_simulation(vehicle, 20.0, EngineControlUnit(kp=0.5, ki=0.2, kd=1.0), total_time=2_000, trace=cycle)
+
+
+@pytest.mark.parametrize('fast_forward', [False, True])
+def test_constant_trace_matches_step_speed(vehicle, tmp_path, fast_forward):
+    cycle = save_drive_cycle(tmp_path / 'constant.npy', np.full(900, 20.0))
+    results = []
+
+    for trace in (None, cycle):
+        np.random.seed(3)
+        random.seed(3)
+        results.append(run_simulation(vehicle, 20.0, EngineControlUnit(kp=0.5, ki=0.2, kd=1.0), total_time=900,
+                                      inclination_generator=RoadInclinationGenerator(),
+                                      fast_forward=fast_forward,
+                                      trace=trace))
+
+    without_trace, with_trace = results
+    assert with_trace.speeds == without_trace.speeds
+    assert with_trace.throttle == without_trace.throttle
+    assert with_trace.inclinations == without_trace.inclinations